@@ -1,36 +1,24 @@
 # Clase para representar a un paciente
 class Paciente:
+    __slots__ = ("nombre", "edad", "cedula")
+
     def __init__(self, nombre, edad, cedula):
         self.nombre = nombre
         self.edad = edad
         self.cedula = cedula
-        self.historial = []  # Lista de citas
-
-    def agregar_cita(self, cita):
-        self.historial.append(cita)
-
-    def mostrar_historial(self):
-        print(f"\nHistorial de citas de {self.nombre}:")
-        for cita in self.historial:
-            print(f"- {cita}")
 
 # Clase para representar a un médico
 class Medico:
+    __slots__ = ("nombre", "especialidad")
+
     def __init__(self, nombre, especialidad):
         self.nombre = nombre
         self.especialidad = especialidad
-        self.citas = []  # Lista de citas del médico
-
-    def asignar_cita(self, cita):
-        self.citas.append(cita)
-
-    def mostrar_citas(self):
-        print(f"\nCitas del Dr. {self.nombre} ({self.especialidad}):")
-        for cita in self.citas:
-            print(f"- {cita}")
 
 # Clase para representar una cita médica
 class Cita:
+    __slots__ = ("fecha", "motivo", "paciente", "medico")
+
     def __init__(self, fecha, motivo, paciente, medico):
         self.fecha = fecha
         self.motivo = motivo
@@ -40,7 +28,53 @@ class Cita:
     def __str__(self):
         return f"{self.fecha} | Motivo: {self.motivo} | Médico: {self.medico.nombre}"
 
-# PRUEBA DEL SISTEMA 
+# Registro central de citas: cada cita se guarda UNA sola vez y se indexa
+# por paciente (cédula) y por médico (nombre), en vez de duplicarla en
+# listas separadas dentro de Paciente y Medico.
+class AgendaCentral:
+    __slots__ = ("_citas", "_by_paciente", "_by_medico", "_next_id")
+
+    def __init__(self):
+        self._citas = {}        # id -> Cita
+        self._by_paciente = {}  # cédula -> set de ids
+        self._by_medico = {}    # nombre del médico -> set de ids
+        self._next_id = 1
+
+    def programar(self, cita):
+        """Registra la cita una vez y actualiza ambos índices."""
+        id_ = self._next_id
+        self._next_id += 1
+        self._citas[id_] = cita
+        self._by_paciente.setdefault(cita.paciente.cedula, set()).add(id_)
+        self._by_medico.setdefault(cita.medico.nombre, set()).add(id_)
+        return id_
+
+    def cancelar(self, id_):
+        cita = self._citas.pop(id_, None)
+        if cita is None:
+            return
+        self._by_paciente.get(cita.paciente.cedula, set()).discard(id_)
+        self._by_medico.get(cita.medico.nombre, set()).discard(id_)
+
+    def citas_de_paciente(self, paciente):
+        ids = self._by_paciente.get(paciente.cedula, set())
+        return sorted((self._citas[i] for i in ids), key=lambda c: c.fecha)
+
+    def citas_de_medico(self, medico):
+        ids = self._by_medico.get(medico.nombre, set())
+        return sorted((self._citas[i] for i in ids), key=lambda c: c.fecha)
+
+    def mostrar_historial(self, paciente):
+        print(f"\nHistorial de citas de {paciente.nombre}:")
+        for cita in self.citas_de_paciente(paciente):
+            print(f"- {cita}")
+
+    def mostrar_citas(self, medico):
+        print(f"\nCitas del Dr. {medico.nombre} ({medico.especialidad}):")
+        for cita in self.citas_de_medico(medico):
+            print(f"- {cita}")
+
+# PRUEBA DEL SISTEMA
 
 # Crear pacientes
 paciente1 = Paciente("Leandro Alava", 19, "0986532018")
@@ -55,17 +89,14 @@ cita1 = Cita("2025-06-30", "Escalofrios", paciente1, medico2)
 cita2 = Cita("2025-06-33", "Dolor de cadera", paciente2, medico2)
 cita3 = Cita("2025-06-30", "Prueba de alergia", paciente1, medico1)
 
-# Asignar citas a pacientes y médicos
-paciente1.agregar_cita(cita1)
-paciente1.agregar_cita(cita3)
-paciente2.agregar_cita(cita2)
-
-medico2.asignar_cita(cita1)
-medico2.asignar_cita(cita2)
-medico1.asignar_cita(cita3)
+# Programar las citas una sola vez en la agenda central
+agenda = AgendaCentral()
+agenda.programar(cita1)
+agenda.programar(cita2)
+agenda.programar(cita3)
 
 # Mostrar historiales y agendas
-paciente1.mostrar_historial()
-paciente2.mostrar_historial()
-medico1.mostrar_citas()
-medico2.mostrar_citas()
+agenda.mostrar_historial(paciente1)
+agenda.mostrar_historial(paciente2)
+agenda.mostrar_citas(medico1)
+agenda.mostrar_citas(medico2)
@@ -1,11 +1,19 @@
 from __future__ import annotations
-from dataclasses import dataclass, asdict
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
 from pathlib import Path
 import json
 import os
+import sys
 import tempfile
 from typing import Dict, List, Set, Tuple
 
+# Serializador JSON acelerado (en C); si no está instalado se usa el stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 #  Excepciones específicas
 
@@ -24,20 +32,22 @@ class ValorInvalido(InventarioError):
 
 #  Modelo de dominio
 
-@dataclass
+@dataclass(slots=True)
 class Producto:
     """
     Representa un producto del inventario.
     Atributos:
-        id: int 
+        id: int
         nombre: str
-        cantidad: int 
-        precio: float 
+        cantidad: int
+        precio: float
     """
     id: int
     nombre: str
     cantidad: int
     precio: float
+    # Slot del cache de búsqueda; se rellena en __post_init__/_trusted
+    _nombre_lower: str = field(init=False, repr=False, compare=False)
 
     # Validaciones de negocio
     def __post_init__(self):
@@ -48,6 +58,8 @@ class Producto:
         self.nombre = self.nombre.strip()
         if not self.nombre:
             raise ValorInvalido("El nombre no puede estar vacío.")
+        # Cache del nombre en minúsculas para búsquedas sin re-lowercase
+        self._nombre_lower = self.nombre.lower()
 
         self.cantidad = int(self.cantidad)
         if self.cantidad < 0:
@@ -69,6 +81,7 @@ class Producto:
         if not nuevo_nombre:
             raise ValorInvalido("El nombre no puede quedar vacío.")
         self.nombre = nuevo_nombre
+        self._nombre_lower = nuevo_nombre.lower()
 
     def get_cantidad(self) -> int:
         return self.cantidad
@@ -90,11 +103,32 @@ class Producto:
 
     # Serialización
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # Explícito en vez de asdict() para no exponer los slots internos
+        return {
+            "id": self.id,
+            "nombre": self.nombre,
+            "cantidad": self.cantidad,
+            "precio": self.precio,
+        }
+
+    @classmethod
+    def _trusted(cls, id: int, nombre: str, cantidad: int, precio: float) -> "Producto":
+        """
+        Constructor rápido para datos ya validados (recarga desde disco).
+        Omite las validaciones de __post_init__; la ruta de usuario
+        (agregar desde el menú) sigue usando el constructor normal.
+        """
+        p = object.__new__(cls)
+        p.id = id
+        p.nombre = nombre
+        p.cantidad = cantidad
+        p.precio = precio
+        p._nombre_lower = nombre.lower()
+        return p
 
     @staticmethod
     def from_dict(data: Dict) -> "Producto":
-        return Producto(
+        return Producto._trusted(
             id=int(data["id"]),
             nombre=str(data["nombre"]),
             cantidad=int(data["cantidad"]),
@@ -104,9 +138,30 @@ class Producto:
 
 class Inventario:
 
+    # Número de eventos en el journal antes de compactar automáticamente
+    UMBRAL_COMPACTACION = 1000
+
     def __init__(self):
         self._items: Dict[int, Producto] = {}
         self._indice_nombres: Dict[str, Set[int]] = {}
+        # Índice invertido de trigramas: cada secuencia de 3 caracteres del
+        # nombre (en minúsculas) apunta al conjunto de IDs que la contienen.
+        self._trigrams: Dict[str, Set[int]] = {}
+        # IDs en orden ascendente, mantenidos con bisect en cada alta/baja
+        # para que listar_todos no tenga que reordenar en cada llamada
+        self._sorted_ids: List[int] = []
+        # Pares (cantidad, id) ordenados: bajo_stock se resuelve con un
+        # corte por bisect en vez de recorrer todos los productos
+        self._by_qty: List[Tuple[int, int]] = []
+        # Cambios pendientes de escribir a disco (patrón "dirty flag")
+        self._dirty: bool = False
+        # Journal de eventos: cada mutación se anota como una línea JSON,
+        # de modo que persistir un cambio cuesta O(1) y no O(N productos).
+        self._ruta_snapshot: Path | None = None
+        self._eventos_journal: int = 0
+        # (mtime_ns, tamaño) de snapshot y journal en la última carga/guardado;
+        # si no cambiaron, recargar desde disco es un no-op
+        self._loaded_stamp: Tuple | None = None
 
     # ---- Operaciones de dominio ----
     def agregar(self, p: Producto) -> None:
@@ -114,6 +169,8 @@ class Inventario:
             raise ProductoYaExiste(f"Ya existe un producto con ID {p.id}.")
         self._items[p.id] = p
         self._idx_add(p)
+        self._dirty = True
+        self._append_event({"op": "add", "p": p.to_dict()})
 
     def eliminar(self, id_: int) -> None:
         id_ = int(id_)
@@ -121,18 +178,24 @@ class Inventario:
             raise ProductoNoExiste(f"No existe el producto con ID {id_}.")
         p = self._items.pop(id_)
         self._idx_remove(p)
+        self._dirty = True
+        self._append_event({"op": "del", "id": id_})
 
     def actualizar_cantidad(self, id_: int, nueva_cantidad: int) -> None:
         id_ = int(id_)
         if id_ not in self._items:
             raise ProductoNoExiste(f"No existe el producto con ID {id_}.")
-        self._items[id_].set_cantidad(nueva_cantidad)
+        self._set_cantidad_indexada(self._items[id_], nueva_cantidad)
+        self._dirty = True
+        self._append_event({"op": "setq", "id": id_, "q": self._items[id_].cantidad})
 
     def actualizar_precio(self, id_: int, nuevo_precio: float) -> None:
         id_ = int(id_)
         if id_ not in self._items:
             raise ProductoNoExiste(f"No existe el producto con ID {id_}.")
         self._items[id_].set_precio(nuevo_precio)
+        self._dirty = True
+        self._append_event({"op": "setp", "id": id_, "p": self._items[id_].precio})
 
     def buscar_por_nombre(self, patron: str) -> List[Producto]:
         """
@@ -141,11 +204,23 @@ class Inventario:
         patron = patron.strip().lower()
         if not patron:
             return []
-        resultado: List[Producto] = []
-        for p in self._items.values():
-            if patron in p.nombre.lower():
-                resultado.append(p)
-        return resultado
+        if len(patron) < 3:
+            # Patrones muy cortos no tienen trigramas: escaneo lineal
+            return [p for p in self._items.values() if patron in p._nombre_lower]
+        # Intersección de las listas de postings de cada trigrama del patrón
+        candidatos: Set[int] | None = None
+        for tg in self._trigramas_de(patron):
+            ids = self._trigrams.get(tg)
+            if not ids:
+                return []
+            candidatos = ids.copy() if candidatos is None else candidatos & ids
+            if not candidatos:
+                return []
+        # Verificación final de subcadena solo sobre los (pocos) candidatos
+        return [
+            self._items[i] for i in candidatos
+            if patron in self._items[i]._nombre_lower
+        ]
 
     def buscar_exactos(self, nombre_exact: str) -> List[Producto]:
         """
@@ -160,63 +235,260 @@ class Inventario:
         Devuelve una lista de tuplas inmutables para presentar o exportar:
         (id, nombre, cantidad, precio)
         """
-        filas = [(p.id, p.nombre, p.cantidad, p.precio) for p in self._items.values()]
-        # Ordenar por ID para impresión estable
-        return sorted(filas, key=lambda t: t[0])
+        # El orden por ID ya está mantenido incrementalmente: una sola pasada
+        items = self._items
+        return [
+            (p.id, p.nombre, p.cantidad, p.precio)
+            for p in (items[i] for i in self._sorted_ids)
+        ]
 
     def bajo_stock(self, umbral: int = 5) -> Set[int]:
         """Conjunto de IDs con stock por debajo del umbral (ejemplo de uso de set)."""
-        return {p.id for p in self._items.values() if p.cantidad < umbral}
+        umbral = int(umbral)
+        corte = bisect_left(self._by_qty, (umbral, -1))
+        return {id_ for _, id_ in self._by_qty[:corte]}
+
+    def _set_cantidad_indexada(self, p: Producto, nueva_cantidad: int) -> None:
+        """Actualiza la cantidad manteniendo el índice (cantidad, id)."""
+        self._qty_discard(p)
+        try:
+            p.set_cantidad(nueva_cantidad)
+        finally:
+            insort(self._by_qty, (p.cantidad, p.id))
+
+    def _qty_discard(self, p: Producto) -> None:
+        clave = (p.cantidad, p.id)
+        i = bisect_left(self._by_qty, clave)
+        if i < len(self._by_qty) and self._by_qty[i] == clave:
+            del self._by_qty[i]
 
     # Persistencia (archivos)
     @staticmethod
-    def _atomic_write_json(path: Path, data: Dict) -> None:
+    def _es_efimero(path: Path) -> bool:
+        """
+        True si la ruta vive en un destino efímero (p. ej. /tmp) o si el
+        usuario desactivó la durabilidad con INV_FSYNC=0: ahí el ritual
+        tmp+fsync+rename no aporta nada.
+        """
+        if os.environ.get("INV_FSYNC") == "0":
+            return True
+        try:
+            return str(path.resolve()).startswith(tempfile.gettempdir())
+        except OSError:
+            return False
+
+    @staticmethod
+    def _atomic_write_json(path: Path, data: Dict, durable: bool = False,
+                           pretty: bool = False) -> None:
         """
         Escritura atómica cross-platform:
         1) Escribe en un archivo temporal dentro del mismo directorio
         2) os.replace para mover sobre el archivo final
         Evita archivos corruptos si el programa se interrumpe a mitad.
+
+        os.replace garantiza atomicidad siempre; el fsync (barrera de disco
+        completa) solo se paga cuando durable=True, p. ej. al salir.
         """
         path.parent.mkdir(parents=True, exist_ok=True)
+        if Inventario._es_efimero(path):
+            # Escritura directa en un solo open/write: sin archivo temporal
+            # ni fsync, que no aportan durabilidad en montajes efímeros
+            if orjson is not None:
+                path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
+            else:
+                with path.open("w", encoding="utf-8") as f:
+                    if pretty:
+                        json.dump(data, f, ensure_ascii=False, indent=2)
+                    else:
+                        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            return
         # NamedTemporaryFile en el MISMO directorio para que os.replace sea seguro en Windows
-        with tempfile.NamedTemporaryFile("w", delete=False, dir=str(path.parent), encoding="utf-8") as tmp:
-            json.dump(data, tmp, ensure_ascii=False, indent=2)
-            tmp.flush()
-            os.fsync(tmp.fileno())
-            temp_name = tmp.name
+        if orjson is not None:
+            # Escritura binaria directa: evita el paso por TextIOWrapper
+            with tempfile.NamedTemporaryFile("wb", delete=False, dir=str(path.parent)) as tmp:
+                tmp.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
+                tmp.flush()
+                if durable:
+                    os.fsync(tmp.fileno())
+                temp_name = tmp.name
+        else:
+            with tempfile.NamedTemporaryFile("w", delete=False, dir=str(path.parent), encoding="utf-8") as tmp:
+                if pretty:
+                    json.dump(data, tmp, ensure_ascii=False, indent=2)
+                else:
+                    # Compacto: la mitad de bytes en disco que con indent=2
+                    json.dump(data, tmp, ensure_ascii=False, separators=(",", ":"))
+                tmp.flush()
+                if durable:
+                    os.fsync(tmp.fileno())
+                temp_name = tmp.name
         os.replace(temp_name, path)
 
-    def guardar(self, path: Path) -> None:
+    @staticmethod
+    def _ruta_journal(path: Path) -> Path:
+        return path.with_suffix(".journal.jsonl")
+
+    @classmethod
+    def _stamp_de(cls, path: Path) -> Tuple:
+        """Huella (mtime_ns, tamaño) del snapshot y su journal."""
+        def huella(p: Path):
+            try:
+                st = p.stat()
+            except OSError:
+                return None
+            return (st.st_mtime_ns, st.st_size)
+        return (huella(path), huella(cls._ruta_journal(path)))
+
+    def _append_event(self, event: Dict) -> None:
+        """
+        Anota una mutación en el journal (una línea JSON, modo append).
+        Si todavía no se conoce la ruta del snapshot se trabaja solo en
+        memoria, igual que antes de la primera carga/guardado.
+        """
+        if self._ruta_snapshot is None:
+            return
+        journal = self._ruta_journal(self._ruta_snapshot)
+        journal.parent.mkdir(parents=True, exist_ok=True)
+        with journal.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._eventos_journal += 1
+        if self._eventos_journal >= self.UMBRAL_COMPACTACION:
+            self.compactar(self._ruta_snapshot)
+
+    def _aplicar_evento(self, event: Dict) -> None:
+        """Reaplica un evento del journal sobre el estado en memoria."""
+        op = event.get("op")
+        if op == "add":
+            p = Producto.from_dict(event["p"])
+            previo = self._items.get(p.id)
+            if previo is not None:
+                # Evento rezagado sobre un snapshot que ya lo incluye:
+                # desindexar el existente para no duplicar entradas en
+                # _sorted_ids / _by_qty
+                self._idx_remove(previo)
+            self._items[p.id] = p
+            self._idx_add(p)
+        elif op == "del":
+            p = self._items.pop(int(event["id"]), None)
+            if p is not None:
+                self._idx_remove(p)
+        elif op == "setq":
+            p = self._items.get(int(event["id"]))
+            if p is not None:
+                self._set_cantidad_indexada(p, event["q"])
+        elif op == "setp":
+            p = self._items.get(int(event["id"]))
+            if p is not None:
+                p.set_precio(event["p"])
+
+    def guardar(self, path: Path, durable: bool = False, pretty: bool = False) -> None:
         payload = {
             "version": 1,
             "productos": [p.to_dict() for p in self._items.values()],
         }
-        self._atomic_write_json(path, payload)
+        self._atomic_write_json(path, payload, durable=durable, pretty=pretty)
+        self._ruta_snapshot = path
+        # El snapshot ya incluye los eventos anotados: si el journal
+        # sobreviviera, la próxima carga los reaplicaría por duplicado
+        journal = self._ruta_journal(path)
+        if journal.exists():
+            journal.write_text("", encoding="utf-8")
+        self._eventos_journal = 0
+        self._dirty = False
+        # Lo que hay en memoria es exactamente lo que quedó en disco
+        self._loaded_stamp = self._stamp_de(path)
+
+    def guardar_pretty(self, path: Path) -> None:
+        """Snapshot legible (indentado) para inspección manual del archivo."""
+        self.guardar(path, durable=True, pretty=True)
+
+    def compactar(self, path: Path, durable: bool = False) -> None:
+        """
+        Reescribe el snapshot completo y vacía el journal.
+        Es la única operación O(N); se paga al salir o cada
+        UMBRAL_COMPACTACION eventos, no en cada mutación.
+        """
+        self.guardar(path, durable=durable)
+
+    def flush(self, path: Path, durable: bool = False) -> None:
+        """
+        Compacta a disco solo si hay cambios pendientes.
+        Permite agrupar varias operaciones del menú en una sola escritura
+        en vez de serializar todo el inventario tras cada acción.
+        """
+        if self._dirty:
+            self.compactar(path, durable=durable)
 
     def cargar(self, path: Path) -> None:
-        if not path.exists():
-            # Inventario vacío si no hay archivo
-            self._items.clear()
-            self._indice_nombres.clear()
+        stamp = self._stamp_de(path)
+        if stamp == self._loaded_stamp:
+            # Nada cambió en disco desde la última carga/guardado
             return
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        productos = data.get("productos", [])
-        self._items.clear()
-        self._indice_nombres.clear()
-        for d in productos:
-            p = Producto.from_dict(d)
-            self._items[p.id] = p
-            self._idx_add(p)
+        self._ruta_snapshot = path
+        # Construcción en una sola pasada sobre diccionarios locales:
+        # evita N llamadas a métodos de instancia y búsquedas de atributo.
+        items: Dict[int, Producto] = {}
+        idx: Dict[str, Set[int]] = {}
+        trigrams: Dict[str, Set[int]] = {}
+        if path.exists():
+            with path.open("rb") as f:
+                contenido = f.read()
+            data = orjson.loads(contenido) if orjson is not None else json.loads(contenido)
+            from_dict = Producto.from_dict
+            trigramas_de = self._trigramas_de
+            for d in data.get("productos", []):
+                p = from_dict(d)
+                items[p.id] = p
+                idx.setdefault(p._nombre_lower, set()).add(p.id)
+                for tg in trigramas_de(p._nombre_lower):
+                    trigrams.setdefault(tg, set()).add(p.id)
+        self._items = items
+        self._indice_nombres = idx
+        self._trigrams = trigrams
+        self._sorted_ids = sorted(items)
+        self._by_qty = sorted((p.cantidad, p.id) for p in items.values())
+        # Reaplicar los eventos posteriores al último snapshot
+        self._eventos_journal = 0
+        journal = self._ruta_journal(path)
+        if journal.exists():
+            with journal.open("r", encoding="utf-8") as f:
+                for linea in f:
+                    linea = linea.strip()
+                    if linea:
+                        self._aplicar_evento(json.loads(linea))
+                        self._eventos_journal += 1
+        # Con journal pendiente, el snapshot está desfasado: compactar al salir
+        self._dirty = self._eventos_journal > 0
+        self._loaded_stamp = stamp
 
     # Índices auxiliares
+    @staticmethod
+    def _trigramas_de(texto: str) -> Set[str]:
+        return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
     def _idx_add(self, p: Producto) -> None:
-        key = p.nombre.strip().lower()
+        insort(self._sorted_ids, p.id)
+        insort(self._by_qty, (p.cantidad, p.id))
+        key = p._nombre_lower
         bucket = self._indice_nombres.setdefault(key, set())
         bucket.add(p.id)
+        for tg in self._trigramas_de(key):
+            self._trigrams.setdefault(tg, set()).add(p.id)
 
     def _idx_remove(self, p: Producto) -> None:
-        key = p.nombre.strip().lower()
+        self._qty_discard(p)
+        i = bisect_left(self._sorted_ids, p.id)
+        if i < len(self._sorted_ids) and self._sorted_ids[i] == p.id:
+            del self._sorted_ids[i]
+        key = p._nombre_lower
+        for tg in self._trigramas_de(key):
+            ids = self._trigrams.get(tg)
+            if ids:
+                ids.discard(p.id)
+                if not ids:
+                    self._trigrams.pop(tg, None)
         bucket = self._indice_nombres.get(key)
         if not bucket:
             return
@@ -251,28 +523,40 @@ def _input_str(msg: str) -> str:
     return s
 
 
+# Texto fijo del menú: una sola escritura a stdout por ciclo
+_MENU = (
+    "\n=== SISTEMA DE GESTIÓN DE INVENTARIO ===\n"
+    "1) Añadir producto\n"
+    "2) Eliminar producto por ID\n"
+    "3) Actualizar CANTIDAD por ID\n"
+    "4) Actualizar PRECIO por ID\n"
+    "5) Buscar productos por nombre\n"
+    "6) Mostrar todos los productos\n"
+    "7) Mostrar IDs con bajo stock\n"
+    "8) Guardar inventario\n"
+    "9) Cargar inventario desde archivo\n"
+    "0) Salir (guarda automáticamente)\n\n"
+)
+
+
 def mostrar_menu() -> None:
-    print("\n=== SISTEMA DE GESTIÓN DE INVENTARIO ===")
-    print("1) Añadir producto")
-    print("2) Eliminar producto por ID")
-    print("3) Actualizar CANTIDAD por ID")
-    print("4) Actualizar PRECIO por ID")
-    print("5) Buscar productos por nombre")
-    print("6) Mostrar todos los productos")
-    print("7) Mostrar IDs con bajo stock")
-    print("8) Guardar inventario")
-    print("9) Cargar inventario desde archivo")
-    print("0) Salir (guarda automáticamente)\n")
+    sys.stdout.write(_MENU)
 
 
 def imprimir_tabla(filas: List[Tuple[int, str, int, float]]) -> None:
     if not filas:
         print("Inventario vacío.")
         return
-    print(f"{'ID':>4}  {'NOMBRE':<30}  {'CANT':>5}  {'PRECIO($)':>10}")
-    print("-" * 56)
-    for id_, nombre, cant, precio in filas:
-        print(f"{id_:>4}  {nombre:<30.30s}  {cant:>5}  {precio:>10.2f}")
+    lineas = [
+        f"{'ID':>4}  {'NOMBRE':<30}  {'CANT':>5}  {'PRECIO($)':>10}",
+        "-" * 56,
+    ]
+    lineas.extend(
+        f"{id_:>4}  {nombre:<30.30s}  {cant:>5}  {precio:>10.2f}"
+        for id_, nombre, cant, precio in filas
+    )
+    # Una sola llamada de escritura para toda la tabla
+    sys.stdout.write("\n".join(lineas) + "\n")
 
 
 def main():
@@ -288,6 +572,9 @@ def main():
     except Exception as e:
         print(f"No se pudo cargar el inventario: {e}")
 
+    # Cada mutación queda anotada en el journal (O(1) por operación);
+    # el snapshot completo solo se reescribe al guardar manualmente
+    # (opción 8), al salir (opción 0) o al compactar por umbral.
     while True:
         mostrar_menu()
         opcion = input("Elige una opción: ").strip()
@@ -299,28 +586,24 @@ def main():
                 cantidad = _input_int("Cantidad: ")
                 precio = _input_float("Precio: ")
                 inv.agregar(Producto(id_, nombre, cantidad, precio))
-                inv.guardar(data_file)
-                print("Producto añadido y guardado.")
+                print("Producto añadido.")
 
             elif opcion == "2":
                 id_ = _input_int("ID a eliminar: ")
                 inv.eliminar(id_)
-                inv.guardar(data_file)
-                print("Producto eliminado y cambios guardados.")
+                print("Producto eliminado.")
 
             elif opcion == "3":
                 id_ = _input_int("ID a actualizar cantidad: ")
                 cantidad = _input_int("Nueva cantidad: ")
                 inv.actualizar_cantidad(id_, cantidad)
-                inv.guardar(data_file)
-                print("Cantidad actualizada y guardada.")
+                print("Cantidad actualizada.")
 
             elif opcion == "4":
                 id_ = _input_int("ID a actualizar precio: ")
                 precio = _input_float("Nuevo precio: ")
                 inv.actualizar_precio(id_, precio)
-                inv.guardar(data_file)
-                print("Precio actualizado y guardado.")
+                print("Precio actualizado.")
 
             elif opcion == "5":
                 patron = _input_str("Nombre o parte del nombre a buscar: ")
@@ -340,7 +623,7 @@ def main():
                     print(f"IDs con bajo stock (< {umbral}): {sorted(list(ids))}")
 
             elif opcion == "8":
-                inv.guardar(data_file)
+                inv.flush(data_file, durable=True)
                 print(f"Guardado manual en: {data_file}")
 
             elif opcion == "9":
@@ -348,7 +631,7 @@ def main():
                 print(f"Cargado desde: {data_file}")
 
             elif opcion == "0":
-                inv.guardar(data_file)
+                inv.flush(data_file, durable=True)
                 print("Saliendo. Inventario guardado.")
                 break
 
@@ -22,6 +22,9 @@ class App(tk.Tk):
 
         # Contador incremental simple para asignar IDs
         self._next_id: int = 1
+        # Filas presentes en la tabla, mantenido en inserción/borrado para
+        # no pedir a Tcl la lista completa de hijos en cada update_status
+        self._count: int = 0
 
         # Configurar rejilla principal para que la tabla expanda
         self.columnconfigure(0, weight=1)
@@ -92,9 +95,9 @@ class App(tk.Tk):
         self.tree.column("texto", width=480, anchor="w")
 
         # Scrollbar vertical
-        vsb = ttk.Scrollbar(table_wrap, orient="vertical", command=self.tree.yview)
-        vsb.grid(row=0, column=1, sticky="ns")
-        self.tree.configure(yscrollcommand=vsb.set)
+        self.vsb = ttk.Scrollbar(table_wrap, orient="vertical", command=self.tree.yview)
+        self.vsb.grid(row=0, column=1, sticky="ns")
+        self.tree.configure(yscrollcommand=self.vsb.set)
 
         # ActionsBar: botones de acciones
         actions = ttk.Frame(self, padding=(12, 10))
@@ -127,6 +130,8 @@ class App(tk.Tk):
         self.tree.bind("<Delete>", self.delete_selected)
         # Ctrl+L para acción Limpiar contextual
         self.bind("<Control-l>", self.smart_clean)
+        # Ctrl+V sobre la tabla: pegar varias líneas como filas
+        self.tree.bind("<Control-v>", self.paste_items)
 
     # Lógica de acciones 
     def add_item(self, event: Optional[tk.Event] = None) -> None:
@@ -140,10 +145,43 @@ class App(tk.Tk):
         iid = self._next_id
         self.tree.insert("", "end", values=(iid, text))
         self._next_id += 1
+        self._count += 1
         # Limpiar Entry y actualizar estado
         self.entry_var.set("")
         self.update_status(f"Agregado ID {iid}.")
 
+    def add_items(self, texts: list[str]) -> None:
+        """Agregar varias filas de una vez (importaciones, pegado masivo).
+
+        Desconecta el callback de scroll durante la carga y actualiza el
+        estado una sola vez al final, en vez de pagar ambos por fila.
+        """
+        texts = [t.strip() for t in texts if t.strip()]
+        if not texts:
+            self._beep()
+            self.update_status("Nada que agregar.")
+            return
+        self.tree.configure(yscrollcommand="")
+        try:
+            insert = self.tree.insert
+            for t in texts:
+                insert("", "end", values=(self._next_id, t))
+                self._next_id += 1
+                self._count += 1
+        finally:
+            self.tree.configure(yscrollcommand=self.vsb.set)
+        self.update_status(f"Agregadas {len(texts)} fila(s).")
+
+    def paste_items(self, event: Optional[tk.Event] = None) -> None:
+        """Pegar el portapapeles en la tabla, una fila por línea."""
+        try:
+            contenido = self.clipboard_get()
+        except tk.TclError:
+            self._beep()
+            self.update_status("Portapapeles vacío.")
+            return
+        self.add_items(contenido.splitlines())
+
     def smart_clean(self, event: Optional[tk.Event] = None) -> None:
         """Acción para el botón "Limpiar":
         - Si hay selección en la tabla: elimina las filas seleccionadas.
@@ -152,8 +190,9 @@ class App(tk.Tk):
         """
         selected = self.tree.selection()
         if selected:
-            for item in selected:
-                self.tree.delete(item)
+            # delete acepta varargs: una sola llamada Tcl para todas las filas
+            self.tree.delete(*selected)
+            self._count -= len(selected)
             self.update_status(f"Eliminadas {len(selected)} fila(s) seleccionada(s).")
             return
         if self.entry_var.get():
@@ -170,8 +209,8 @@ class App(tk.Tk):
             self._beep()
             return
         if messagebox.askyesno("Confirmar eliminación", f"¿Eliminar {len(selected)} fila(s) seleccionada(s)?"):
-            for item in selected:
-                self.tree.delete(item)
+            self.tree.delete(*selected)
+            self._count -= len(selected)
             self.update_status(f"Eliminadas {len(selected)} fila(s).")
 
     def clear_all(self) -> None:
@@ -181,14 +220,13 @@ class App(tk.Tk):
             self._beep()
             return
         if messagebox.askyesno("Confirmar limpieza total", "¿Eliminar todas las filas de la tabla?"):
-            for item in children:
-                self.tree.delete(item)
+            self.tree.delete(*children)
+            self._count = 0
             self.update_status("Tabla vaciada.")
 
     # Utilitarios 
     def update_status(self, msg: str) -> None:
-        count = len(self.tree.get_children())
-        self.status_var.set(f"{count} elemento(s) · {msg}")
+        self.status_var.set(f"{self._count} elemento(s) · {msg}")
 
     def on_quit(self) -> None:
         self.destroy()
@@ -1,39 +1,50 @@
 
 # Clase base
 class CuentaBancaria:
+    # Atributos fijos: evita el __dict__ por instancia
+    __slots__ = ("titular", "numero_cuenta", "_CuentaBancaria__saldo")
+
     def __init__(self, titular, numero_cuenta, saldo_inicial):
         self.titular = titular
         self.numero_cuenta = numero_cuenta
         self.__saldo = saldo_inicial  # Encapsulado
     
     def mostrar_info(self):
-        print(f"Titular: {self.titular}")
-        print(f"Número de Cuenta: {self.numero_cuenta}")
-        print(f"Saldo: ${self.__saldo:.2f}")
+        # Un solo print (una sola escritura a stdout) por bloque de salida
+        print(f"Titular: {self.titular}\n"
+              f"Número de Cuenta: {self.numero_cuenta}\n"
+              f"Saldo: ${self.__saldo:.2f}")
 
     def obtener_saldo(self):
         return self.__saldo
 
+    def _ajustar_saldo(self, delta):
+        # Punto único de modificación del saldo para las clases derivadas,
+        # sin recurrir al nombre decorado (_CuentaBancaria__saldo)
+        self.__saldo += delta
+
     def depositar(self, monto):
         if monto > 0:
             self.__saldo += monto
-            print(f"Depósito de ${monto:.2f} realizado.")
-            print(f"Saldo actual: ${self.__saldo:.2f}")
+            print(f"Depósito de ${monto:.2f} realizado.\n"
+                  f"Saldo actual: ${self.__saldo:.2f}")
         else:
             print("Monto inválido.")
 
     def retirar(self, monto):
         if monto <= self.__saldo:
             self.__saldo -= monto
-            print(f"Retiro de ${monto:.2f} realizado.")
-            print(f"Saldo actual: ${self.__saldo:.2f}")
+            print(f"Retiro de ${monto:.2f} realizado.\n"
+                  f"Saldo actual: ${self.__saldo:.2f}")
         else:
-            print("Fondos insuficientes.")
-            print(f"Saldo disponible: ${self.__saldo:.2f}")
+            print("Fondos insuficientes.\n"
+                  f"Saldo disponible: ${self.__saldo:.2f}")
 
 
 # Clase derivada: Cuenta de Ahorros
 class CuentaAhorros(CuentaBancaria):
+    __slots__ = ("tasa_interes",)
+
     def __init__(self, titular, numero_cuenta, saldo_inicial, tasa_interes):
         super().__init__(titular, numero_cuenta, saldo_inicial)
         self.tasa_interes = tasa_interes
@@ -45,6 +56,8 @@ class CuentaAhorros(CuentaBancaria):
 
 # Clase derivada: Cuenta Corriente
 class CuentaCorriente(CuentaBancaria):
+    __slots__ = ("limite_sobregiro",)
+
     def __init__(self, titular, numero_cuenta, saldo_inicial, limite_sobregiro):
         super().__init__(titular, numero_cuenta, saldo_inicial)
         self.limite_sobregiro = limite_sobregiro
@@ -53,13 +66,12 @@ class CuentaCorriente(CuentaBancaria):
         print("Cuenta Corriente:")
         saldo_disponible = self.obtener_saldo() + self.limite_sobregiro
         if monto <= saldo_disponible:
-            # Acceso forzado al atributo privado (solo dentro de la clase)
-            self._CuentaBancaria__saldo -= monto
-            print(f"Retiro de ${monto:.2f} Realizado con sobregiro.")
-            print(f"Saldo actual: ${self._CuentaBancaria__saldo:.2f}")
+            self._ajustar_saldo(-monto)
+            print(f"Retiro de ${monto:.2f} Realizado con sobregiro.\n"
+                  f"Saldo actual: ${self.obtener_saldo():.2f}")
         else:
-            print("Supera el límite de sobregiro permitido.")
-            print(f"Saldo disponible con sobregiro: ${saldo_disponible:.2f}")
+            print("Supera el límite de sobregiro permitido.\n"
+                  f"Saldo disponible con sobregiro: ${saldo_disponible:.2f}")
 
 
 # Demostración
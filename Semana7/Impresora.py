@@ -1,6 +1,9 @@
+import sys
 import time
 
 class Impresora:
+    __slots__ = ("marca", "encendida")
+
     def __init__(self, marca):
         """
         Constructor que se ejecuta al crear el objeto Impresora.
@@ -10,13 +13,16 @@ class Impresora:
         self.encendida = True
         print(f"[ENCENDIDA] Impresora {self.marca} está ahora encendida.")
 
-    def imprimir(self, documento):
+    def imprimir(self, documento, simulate_delay: float = 0.0):
         """
         Método que simula la impresión de un documento.
+        La pausa "de impresión" es opcional para no bloquear
+        pruebas o usos no interactivos.
         """
         if self.encendida:
             print(f"Imprimiendo documento: '{documento}'...")
-            time.sleep(2)  # Simula tiempo de impresión
+            if simulate_delay:
+                time.sleep(simulate_delay)  # Simula tiempo de impresión
             print("Documento impreso correctamente.\n")
         else:
             print("Error: La impresora está apagada.")
@@ -36,9 +42,10 @@ class Impresora:
 # Crear un objeto de la clase Impresora
 mi_impresora = Impresora("Epson L1250")
 
-# Simular impresión de documentos
-mi_impresora.imprimir("Doc1.docx")
-mi_impresora.imprimir("Doc2.docx")
+# Simular impresión de documentos (con pausa solo en terminal interactiva)
+retardo = 2 if sys.stdout.isatty() else 0
+mi_impresora.imprimir("Doc1.docx", simulate_delay=retardo)
+mi_impresora.imprimir("Doc2.docx", simulate_delay=retardo)
 
 # Eliminar el objeto (opcional, también se destruye al final del programa)
 del mi_impresora
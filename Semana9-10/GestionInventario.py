@@ -1,17 +1,52 @@
-from typing import Any, List, Optional
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+import atexit
+import hashlib
+import mmap
 import os
-import tempfile
+import re
+import struct
+import sys
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin flock, se guarda sin candado entre procesos
+    fcntl = None
 
 # Formato
 DELIM = "|"
+# Registro binario opcional (archivos .invb): id, cantidad, precio (double)
+# y longitud del nombre; el nombre en UTF-8 va a continuación
+_REG_BIN = struct.Struct("<IIdI")
+# Tamaño mínimo del diario de deltas a partir del cual conviene compactar;
+# para inventarios grandes manda el doble del tamaño del snapshot
+_UMBRAL_JOURNAL = 64 * 1024
+# Por debajo de este tamaño, leer el archivo de una vez sale más barato
+# que montar un mapeo de memoria
+_UMBRAL_MMAP = 1 << 20
+
+
+@lru_cache(maxsize=256)
+def _normalizar_termino(termino: str) -> str:
+    """Normalización memoizada del término de búsqueda (strip + lower)."""
+    return termino.strip().lower()
 
 #  Clases 
 class Producto:
+    # Sin __dict__ por instancia: menos memoria y acceso a atributos más
+    # directo para inventarios grandes
+    __slots__ = ("_id", "_nombre", "_nombre_lower", "_cantidad", "_precio", "_linea_cache")
+
     def __init__(self, id_: int, nombre: str, cantidad: int, precio: float) -> None:
         self._id = None
         self._nombre = None
         self._cantidad = None
         self._precio = None
+        self._linea_cache: Optional[str] = None
         self.id = id_
         self.nombre = nombre
         self.cantidad = cantidad
@@ -28,6 +63,7 @@ class Producto:
         if value < 0:
             raise ValueError("El ID no puede ser negativo.")
         self._id = value
+        self._linea_cache = None
 
     @property
     def nombre(self) -> str:
@@ -38,6 +74,10 @@ class Producto:
         if not isinstance(value, str) or not value.strip():
             raise ValueError("El nombre debe ser una cadena no vacía.")
         self._nombre = value.strip()
+        # Cache en minúsculas: la búsqueda por nombre no paga lower() por
+        # producto en cada consulta
+        self._nombre_lower = self._nombre.lower()
+        self._linea_cache = None
 
     @property
     def cantidad(self) -> int:
@@ -50,6 +90,7 @@ class Producto:
         if value < 0:
             raise ValueError("La cantidad no puede ser negativa.")
         self._cantidad = value
+        self._linea_cache = None
 
     @property
     def precio(self) -> float:
@@ -64,54 +105,192 @@ class Producto:
         if value < 0:
             raise ValueError("El precio no puede ser negativo.")
         self._precio = value
+        self._linea_cache = None
 
     def __repr__(self) -> str:
         return f"Producto(id={self.id}, nombre='{self.nombre}', cantidad={self.cantidad}, precio={self.precio:.2f})"
 
     def a_linea(self) -> str:
-        return f"{self.id}{DELIM}{self.nombre}{DELIM}{self.cantidad}{DELIM}{self.precio}\n"
+        # La línea serializada se cachea por instancia y se invalida en los
+        # setters: en una reescritura completa solo los productos mutados
+        # vuelven a pagar el formateo
+        linea = self._linea_cache
+        if linea is None:
+            linea = f"{self._id}{DELIM}{self._nombre}{DELIM}{self._cantidad}{DELIM}{self._precio}\n"
+            self._linea_cache = linea
+        return linea
+
+    def a_bytes(self) -> bytes:
+        """Registro binario equivalente a a_linea (formato .invb)."""
+        nombre_b = self._nombre.encode("utf-8")
+        return _REG_BIN.pack(self._id, self._cantidad, self._precio, len(nombre_b)) + nombre_b
+
+    @classmethod
+    def _from_trusted(cls, id_: int, nombre: str, cantidad: int, precio: float) -> "Producto":
+        """
+        Construcción sin pasar por los setters: para datos que ya fueron
+        validados al guardarse (recarga del archivo). El camino del usuario
+        sigue usando __init__ con validación completa.
+        """
+        obj = cls.__new__(cls)
+        obj._id = id_
+        obj._nombre = nombre
+        obj._nombre_lower = nombre.lower()
+        obj._cantidad = cantidad
+        obj._precio = precio
+        obj._linea_cache = None
+        return obj
 
     @staticmethod
     def desde_linea(linea: str) -> "Producto":
-        partes = [p.strip() for p in linea.rstrip("\n").split(DELIM)]
-        if len(partes) != 4:
+        # Desempaquetado directo con maxsplit: sin lista intermedia ni un
+        # strip() por campo (int()/float() toleran espacios alrededor y el
+        # nombre se guardó ya normalizado)
+        try:
+            id_str, nombre, cant_str, precio_str = linea.rstrip("\r\n").split(DELIM, 3)
+        except ValueError:
             raise ValueError("Número de columnas inválido.")
-        id_str, nombre, cant_str, precio_str = partes
-        id_ = int(id_str)
-        cantidad = int(cant_str)
-        precio = float(precio_str)
-        return Producto(id_, nombre, cantidad, precio)
+        # int()/float() ya rechazan datos malformados; el resto de las
+        # validaciones de los setters es redundante en la recarga
+        return Producto._from_trusted(int(id_str), nombre.strip(), int(cant_str), float(precio_str))
+
+
+class _ListaSoloLectura(Sequence):
+    """
+    Vista de solo lectura sobre la lista interna de productos: evita
+    copiar N referencias en cada consulta. Quien necesite una lista
+    real puede hacer list(inventario.productos).
+    """
+    __slots__ = ("_data",)
+
+    def __init__(self, data: List[Producto]) -> None:
+        self._data = data
+
+    def __getitem__(self, i):
+        return self._data[i]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class _LoteInventario:
+    """
+    Contexto de carga masiva: mientras está abierto se suprimen los
+    registros (y fsync) del diario por mutación, y al salir se hace un
+    único volcado completo. Convierte M mutaciones en un solo guardado.
+    """
+    __slots__ = ("_inv",)
+
+    def __init__(self, inv: "Inventario") -> None:
+        self._inv = inv
+
+    def __enter__(self) -> "Inventario":
+        self._inv._batch_depth += 1
+        return self._inv
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._inv._batch_depth -= 1
+        if self._inv._batch_depth == 0:
+            self._inv.flush()
+        return False
 
 
 class Inventario:
     def __init__(self, ruta_archivo: str = "inventario.txt") -> None:
+        # Lista ordenada por ID con un array paralelo de IDs (enteros sin
+        # caja): la posición de un producto se localiza con bisect a nivel
+        # de C y el archivo guardado queda en orden estable, apto para diff
         self._productos: List[Producto] = []
+        self._ids = array("Q")
+        # Índice por ID: una sonda de hash en vez de recorrer la lista
+        self._indice: Dict[int, Producto] = {}
         self.ruta_archivo = ruta_archivo
+        # Directorio destino resuelto una sola vez: se usa en cada guardado
+        self._dir = os.path.dirname(ruta_archivo) or "."
+        # Formato binario opcional: parsear números con struct en vez de
+        # int()/float() carácter a carácter (cargas masivas)
+        self._binario = ruta_archivo.endswith(".invb")
+        # Guardado diferido: las mutaciones marcan "sucio" y un timer de
+        # 1 s agrupa ráfagas de cambios en una sola reescritura atómica
+        self._dirty = False
+        self._flush_programado = False
+        self._batch_depth = 0
+        self._lock = threading.Lock()
+        # Diario de deltas: cada mutación persiste como un registro O(1)
+        # añadido al final; la reescritura completa queda como compactación
+        self._ruta_journal = ruta_archivo + ".journal"
+        # Hash del último contenido escrito: permite saltarse reescrituras
+        # cuando la serialización no cambió
+        self._hash_escrito: Optional[bytes] = None
+        self._bytes_snapshot = 0
         self._asegurar_archivo()
         self._cargar_desde_archivo()
+        payload_inicial = self._payload()
+        self._hash_escrito = hashlib.sha256(payload_inicial).digest()
+        self._bytes_snapshot = len(payload_inicial)
+        self._aplicar_journal()
+        atexit.register(self._flush_si_dirty)
 
     @property
-    def productos(self) -> List[Producto]:
-        return list(self._productos)
+    def productos(self) -> Sequence:
+        return _ListaSoloLectura(self._productos)
 
     def _asegurar_archivo(self) -> None:
-        if not os.path.exists(self.ruta_archivo):
-            try:
-                with open(self.ruta_archivo, "w", encoding="utf-8") as f:
-                    f.write("")
-            except PermissionError:
-                print(f"Sin permisos para crear '{self.ruta_archivo}'. "
-                      "Se trabajará solo en memoria y no se guardará en disco.")
-            except OSError as e:
-                print(f"No se pudo crear '{self.ruta_archivo}': {e}. "
-                      "Se trabajará solo en memoria.")
+        # Creación exclusiva en vez de exists()+open(): un solo openat sin
+        # ventana de carrera entre la comprobación y la creación
+        try:
+            open(self.ruta_archivo, "x", encoding="utf-8").close()
+        except FileExistsError:
+            pass
+        except PermissionError:
+            print(f"Sin permisos para crear '{self.ruta_archivo}'. "
+                  "Se trabajará solo en memoria y no se guardará en disco.")
+        except OSError as e:
+            print(f"No se pudo crear '{self.ruta_archivo}': {e}. "
+                  "Se trabajará solo en memoria.")
+
+    def _cargar_binario(self) -> None:
+        with open(self.ruta_archivo, "rb") as f:
+            buf = f.read()
+        offset = 0
+        tam = _REG_BIN.size
+        while offset + tam <= len(buf):
+            id_, cantidad, precio, nlen = _REG_BIN.unpack_from(buf, offset)
+            offset += tam
+            nombre = buf[offset:offset + nlen].decode("utf-8")
+            offset += nlen
+            self._reemplazar_o_agregar(Producto._from_trusted(id_, nombre, cantidad, precio))
 
     def _cargar_desde_archivo(self) -> None:
-        if not os.path.exists(self.ruta_archivo):
-            return
         try:
-            with open(self.ruta_archivo, "r", encoding="utf-8") as f:
-                for idx, linea in enumerate(f, start=1):
+            if self._binario:
+                self._cargar_binario()
+                return
+            # mmap en vez de iterar el archivo línea a línea: el escaneo de
+            # saltos de línea ocurre a nivel de C (memchr) y se evita copiar
+            # el contenido a un buffer de usuario intermedio. Para archivos
+            # pequeños una sola lectura completa es aún más barata que el
+            # propio mapeo
+            es_mmap = False
+            with open(self.ruta_archivo, "rb") as f:
+                tam = os.fstat(f.fileno()).st_size
+                if tam == 0:
+                    return
+                if tam <= _UMBRAL_MMAP:
+                    buf = f.read()
+                else:
+                    buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    es_mmap = True
+            try:
+                inicio = 0
+                total = len(buf)
+                idx = 0
+                while inicio < total:
+                    nl = buf.find(b"\n", inicio)
+                    fin = total if nl < 0 else nl
+                    idx += 1
+                    linea = buf[inicio:fin].decode("utf-8")
+                    inicio = fin + 1
                     if not linea.strip():
                         continue
                     try:
@@ -119,6 +298,12 @@ class Inventario:
                         self._reemplazar_o_agregar(p)
                     except Exception as e:
                         print(f"Línea {idx} corrupta en '{self.ruta_archivo}': {e}. Saltada.")
+            finally:
+                if es_mmap:
+                    buf.close()
+        except FileNotFoundError:
+            # Sin archivo no hay nada que cargar (p. ej. no se pudo crear)
+            return
         except PermissionError:
             print(f"Sin permisos de lectura para '{self.ruta_archivo}'. "
                   "Se continuará con inventario en memoria.")
@@ -126,111 +311,350 @@ class Inventario:
             print(f"Error leyendo '{self.ruta_archivo}': {e}. "
                   "Se continuará con inventario en memoria.")
 
+    @staticmethod
+    def _fsync_directorio(directorio: str) -> None:
+        """
+        fsync del directorio padre tras el rename: persiste la entrada
+        nueva en el propio directorio. Solo tiene sentido en POSIX y hay
+        sistemas de archivos que no lo soportan (se ignora el error).
+        """
+        if os.name != "posix":
+            return
+        try:
+            dfd = os.open(directorio, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dfd)
+        except OSError:
+            pass
+        finally:
+            os.close(dfd)
+
+    def _bloquear(self) -> Optional[int]:
+        """
+        Candado flock exclusivo sobre el archivo destino: dos procesos
+        guardando el mismo inventario no se pisan el rename mutuamente.
+        Devuelve el descriptor del candado, o None si no hay flock.
+        """
+        if fcntl is None:
+            return None
+        try:
+            fd = os.open(self.ruta_archivo, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            return None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+    @staticmethod
+    def _desbloquear(fd: Optional[int]) -> None:
+        if fd is None:
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        except OSError:
+            pass
+        os.close(fd)
+
+    def _payload(self) -> bytes:
+        """Contenido completo del archivo según el estado en memoria."""
+        if self._binario:
+            return b"".join([p.a_bytes() for p in self._productos])
+        return "".join([p.a_linea() for p in self._productos]).encode("utf-8")
+
     def _guardar_atomico(self) -> None:
-        directorio = os.path.dirname(self.ruta_archivo) or "."
+        payload = self._payload()
+        # Si la serialización no cambió respecto a lo último escrito, no
+        # hay nada que reescribir (mutaciones que se cancelan entre sí)
+        h = hashlib.sha256(payload).digest()
+        if h == self._hash_escrito:
+            return
+        lock_fd = self._bloquear()
         try:
-            fd, ruta_tmp = tempfile.mkstemp(prefix=".inv_", dir=directorio, text=True)
+            # Ruta temporal fija junto al destino (mismo sistema de archivos,
+            # rename atómico): se ahorra el mkstemp con nombre aleatorio por
+            # guardado, y el flock ya serializa a los escritores concurrentes
+            ruta_tmp = self.ruta_archivo + ".tmp"
             try:
-                with os.fdopen(fd, "w", encoding="utf-8") as tmp:
-                    for p in self._productos:
-                        tmp.write(p.a_linea())
+                with open(ruta_tmp, "wb") as tmp:
+                    # Un solo write con todo el contenido en vez de una
+                    # llamada por producto
+                    tmp.write(payload)
+                    # Asegura que los datos lleguen al disco antes del rename:
+                    # sin esto un corte de luz puede dejar el archivo vacío
+                    tmp.flush()
+                    os.fsync(tmp.fileno())
                 os.replace(ruta_tmp, self.ruta_archivo)
+                self._fsync_directorio(self._dir)
+                self._hash_escrito = h
+                self._bytes_snapshot = len(payload)
             except Exception:
                 try:
                     os.remove(ruta_tmp)
-                except Exception:
+                except FileNotFoundError:
                     pass
                 raise
         except PermissionError:
             raise PermissionError("Sin permisos de escritura en la carpeta/archivo de inventario.")
         except OSError as e:
             raise OSError(f"Fallo de E/S al guardar el inventario: {e}")
+        finally:
+            self._desbloquear(lock_fd)
 
     def _reemplazar_o_agregar(self, producto: Producto) -> None:
-        for i, p in enumerate(self._productos):
-            if p.id == producto.id:
-                self._productos[i] = producto
+        i = bisect_left(self._ids, producto.id)
+        if i < len(self._ids) and self._ids[i] == producto.id:
+            self._productos[i] = producto
+        else:
+            self._ids.insert(i, producto.id)
+            self._productos.insert(i, producto)
+        self._indice[producto.id] = producto
+
+    def _append_journal(self, registro: str) -> None:
+        """
+        Añade un registro de delta al diario y lo fuerza a disco: una
+        página escrita al final del archivo en vez de reescribir el
+        inventario completo por cada mutación.
+        """
+        if self._batch_depth:
+            # En carga masiva no se paga un fsync por registro: el volcado
+            # único al cerrar el lote persiste todo de una vez
+            return
+        try:
+            with open(self._ruta_journal, "a", encoding="utf-8") as f:
+                f.write(registro)
+                f.flush()
+                os.fsync(f.fileno())
+                if f.tell() > max(_UMBRAL_JOURNAL, 2 * self._bytes_snapshot):
+                    # El diario superó el doble del snapshot vivo: compactar
+                    # cuesta menos que seguir reproduciendo deltas al cargar
+                    self._flush_si_dirty()
+        except OSError:
+            # Sin diario se pierde durabilidad inmediata, pero el volcado
+            # diferido sigue persistiendo los cambios
+            pass
+
+    def _aplicar_journal(self) -> None:
+        """Reaplica los deltas pendientes del diario sobre el snapshot."""
+        try:
+            f = open(self._ruta_journal, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        except OSError:
+            return
+        aplicados = 0
+        with f:
+            for linea in f:
+                aplicados += 1
+                partes = linea.rstrip("\n").split(DELIM)
+                op = partes[0]
+                try:
+                    if op == "ADD":
+                        self._reemplazar_o_agregar(Producto._from_trusted(
+                            int(partes[1]), partes[2], int(partes[3]), float(partes[4])))
+                    elif op == "DEL":
+                        id_ = int(partes[1])
+                        if id_ in self._indice:
+                            i = bisect_left(self._ids, id_)
+                            del self._ids[i]
+                            del self._productos[i]
+                            del self._indice[id_]
+                    elif op == "UPD":
+                        p = self._indice.get(int(partes[1]))
+                        if p is not None:
+                            p._cantidad = int(partes[2])
+                            p._precio = float(partes[3])
+                            p._linea_cache = None
+                except (IndexError, ValueError):
+                    print(f"Registro corrupto en '{self._ruta_journal}': {linea!r}. Saltado.")
+        if aplicados:
+            # El estado en memoria va por delante del snapshot: el próximo
+            # volcado lo compacta y vacía el diario
+            self._mark_dirty()
+
+    def _truncar_journal(self) -> None:
+        try:
+            os.truncate(self._ruta_journal, 0)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            pass
+
+    def _mark_dirty(self) -> None:
+        """Marca cambios pendientes y programa un volcado diferido."""
+        with self._lock:
+            self._dirty = True
+            if not self._flush_programado:
+                self._flush_programado = True
+                timer = threading.Timer(1.0, self._flush_si_dirty)
+                timer.daemon = True
+                timer.start()
+
+    def _flush_si_dirty(self) -> None:
+        with self._lock:
+            self._flush_programado = False
+            if not self._dirty:
                 return
-        self._productos.append(producto)
-
-    def anadir_producto(self, producto: Producto) -> bool:
-        if any(p.id == producto.id for p in self._productos):
-            return False
-        self._productos.append(producto)
+            # La marca se limpia ANTES de serializar: una mutación que
+            # llegue durante la escritura vuelve a ponerla y no queda
+            # borrada por este volcado, que ya no la incluye
+            self._dirty = False
         try:
             self._guardar_atomico()
-            return True
-        except Exception as e:
-            self._productos.pop()
-            raise e
+        except Exception:
+            # El volcado falló: los cambios siguen pendientes
+            with self._lock:
+                self._dirty = True
+            raise
+        with self._lock:
+            if self._dirty:
+                # Mutación concurrente durante la escritura: su registro del
+                # diario debe sobrevivir; el próximo volcado compactará
+                return
+            # El snapshot ya incluye todos los deltas: el diario se vacía
+            self._truncar_journal()
 
-    def eliminar_por_id(self, id_: int) -> bool:
-        for i, p in enumerate(self._productos):
-            if p.id == id_:
-                backup = self._productos[i]
-                del self._productos[i]
-                try:
-                    self._guardar_atomico()
-                    return True
-                except Exception as e:
-                    self._productos.insert(i, backup)
-                    raise e
-        return False
+    def flush(self) -> None:
+        """Escritura inmediata de los cambios pendientes (p. ej. al salir)."""
+        self._flush_si_dirty()
 
-    def actualizar_por_id(self, id_: int, *, cantidad: Optional[int] = None, precio: Optional[float] = None) -> bool:
-        for i, p in enumerate(self._productos):
-            if p.id == id_:
-                prev = Producto(p.id, p.nombre, p.cantidad, p.precio)
-                try:
-                    if cantidad is not None:
-                        p.cantidad = cantidad
-                    if precio is not None:
-                        p.precio = precio
-                    self._guardar_atomico()
-                    return True
-                except Exception as e:
-                    self._productos[i] = prev
-                    raise e
-        return False
+    def batch(self) -> _LoteInventario:
+        """Agrupa una ráfaga de mutaciones en un único guardado al salir."""
+        return _LoteInventario(self)
 
-    def buscar_por_nombre(self, termino: str) -> List[Producto]:
-        termino = termino.strip().lower()
-        return [p for p in self._productos if termino in p.nombre.lower()]
+    def anadir_producto(self, producto: Producto) -> bool:
+        if producto.id in self._indice:
+            return False
+        i = bisect_left(self._ids, producto.id)
+        self._ids.insert(i, producto.id)
+        self._productos.insert(i, producto)
+        self._indice[producto.id] = producto
+        self._append_journal(f"ADD{DELIM}" + producto.a_linea())
+        self._mark_dirty()
+        return True
 
-    def mostrar_todos(self) -> List[Producto]:
-        return list(self._productos)
+    def eliminar_por_id(self, id_: int) -> bool:
+        if id_ not in self._indice:
+            return False
+        i = bisect_left(self._ids, id_)
+        del self._ids[i]
+        del self._productos[i]
+        del self._indice[id_]
+        self._append_journal(f"DEL{DELIM}{id_}\n")
+        self._mark_dirty()
+        return True
 
+    def actualizar_por_id(self, id_: int, *, cantidad: Optional[int] = None, precio: Optional[float] = None) -> bool:
+        p = self._indice.get(id_)
+        if p is None:
+            return False
+        # Actualización sin cambio real: ni diario, ni invalidación de
+        # caché, ni marca de sucio (el disco es el coste dominante)
+        if (cantidad is None or cantidad == p._cantidad) and \
+                (precio is None or precio == p._precio):
+            return True
+        if cantidad is not None:
+            p.cantidad = cantidad
+        if precio is not None:
+            p.precio = precio
+        self._append_journal(f"UPD{DELIM}{p.id}{DELIM}{p.cantidad}{DELIM}{p.precio}\n")
+        self._mark_dirty()
+        return True
+
+    def buscar_por_nombre(self, termino: str, limite: Optional[int] = None) -> List[Producto]:
+        termino = _normalizar_termino(termino)
+        # Término vacío: todo coincidiría; mejor no recorrer nada
+        if not termino:
+            return []
+        if limite is None:
+            return [p for p in self._productos if termino in p._nombre_lower]
+        # Con límite se corta el recorrido en cuanto hay suficientes
+        # resultados, sin materializar la lista completa
+        resultados: List[Producto] = []
+        for p in self._productos:
+            if termino in p._nombre_lower:
+                resultados.append(p)
+                if len(resultados) >= limite:
+                    break
+        return resultados
+
+    def mostrar_todos(self) -> Sequence:
+        return _ListaSoloLectura(self._productos)
+
+    def valor_total(self) -> float:
+        """
+        Valor monetario del inventario (suma de cantidad × precio).
+        Lee los slots directamente para no pagar dos descriptores de
+        propiedad por producto en el recorrido.
+        """
+        return sum(p._cantidad * p._precio for p in self._productos)
+
+
+# Prevalidación con regex compilada: levantar y atrapar ValueError por cada
+# entrada mal tecleada es mucho más caro que un match fallido
+_ENTERO_RE = re.compile(r"^[+-]?\d+$")
+# La mantisa admite ".5" y "5." igual que float()
+_FLOTANTE_RE = re.compile(r"^[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?$")
+
+# Entrada por lotes: con stdin redirigido (sin TTY) se lee todo de una vez
+# y las líneas se sirven desde memoria, sin pagar un input() —con su
+# impresión de prompt y su flush— por cada dato
+_lineas_lote = None
+
+def _leer_linea(prompt: str) -> str:
+    global _lineas_lote
+    if sys.stdin.isatty():
+        return input(prompt)
+    if _lineas_lote is None:
+        _lineas_lote = iter(sys.stdin.read().splitlines())
+    try:
+        return next(_lineas_lote)
+    except StopIteration:
+        raise EOFError("Fin de la entrada.")
 
 def leer_entero(prompt: str) -> int:
     while True:
-        try:
-            return int(input(prompt))
-        except ValueError:
-            print("Entrada inválida: introduce un número entero.")
+        s = _leer_linea(prompt).strip()
+        if _ENTERO_RE.match(s):
+            return int(s)
+        print("Entrada inválida: introduce un número entero.")
 
 def leer_flotante(prompt: str) -> float:
     while True:
-        try:
-            return float(input(prompt))
-        except ValueError:
-            print("Entrada inválida: introduce un número (puede tener decimales).")
+        s = _leer_linea(prompt).strip()
+        if _FLOTANTE_RE.match(s):
+            return float(s)
+        print("Entrada inválida: introduce un número (puede tener decimales).")
 
 def imprimir_tabla(productos: List[Producto]) -> None:
     if not productos:
         print("(No hay productos)")
         return
     headers = ["ID", "Nombre", "Cantidad", "Precio"]
-    filas = [[str(p.id), p.nombre, str(p.cantidad), f"{p.precio:.2f}"] for p in productos]
-    anchos = [max(len(h), *(len(f[i]) for f in filas)) for i, h in enumerate(headers)]
-
-    def fmt_row(vals):
-        return " | ".join(val.ljust(anchos[i]) for i, val in enumerate(vals))
-
+    # Una sola pasada: se formatea cada fila y se actualizan los anchos al
+    # vuelo, en vez de recalcular el máximo columna por columna después
+    anchos = [len(h) for h in headers]
+    filas = []
+    for p in productos:
+        fila = (str(p.id), p.nombre, str(p.cantidad), f"{p.precio:.2f}")
+        for i, valor in enumerate(fila):
+            if len(valor) > anchos[i]:
+                anchos[i] = len(valor)
+        filas.append(fila)
+
+    # Formato % precompilado con los anchos ya conocidos: un solo formateo
+    # a nivel de C por fila en vez de un ljust por columna
+    fmt = " | ".join(f"%-{w}s" for w in anchos)
     sep = "-+-".join("-" * w for w in anchos)
-    print(fmt_row(headers))
-    print(sep)
-    for fila in filas:
-        print(fmt_row(fila))
+    # Una sola escritura a stdout con toda la tabla, en vez de un print
+    # (y su write) por fila
+    salida = [fmt % tuple(headers), sep]
+    salida.extend(fmt % fila for fila in filas)
+    sys.stdout.write("\n".join(salida) + "\n")
 
 
 def menu():
@@ -253,78 +677,78 @@ def menu():
         "3": "Actualizar cantidad/precio por ID",
         "4": "Buscar producto(s) por nombre",
         "5": "Mostrar todos los productos",
+        "6": "Valor total del inventario",
         "0": "Salir",
     }
 
+    # El menú no cambia: se ordena una sola vez fuera del bucle
+    opciones_ordenadas = sorted(opciones.keys())
+
     while True:
         print("\n=== Sistema de Gestión de Inventarios ===")
-        for k in sorted(opciones.keys()):
+        for k in opciones_ordenadas:
             print(f"{k}. {opciones[k]}")
-        opcion = input("Elige una opción: ").strip()
+        opcion = _leer_linea("Elige una opción: ").strip()
 
         if opcion == "1":
             try:
                 id_ = leer_entero("ID (entero y único): ")
-                nombre = input("Nombre: ").strip()
+                nombre = _leer_linea("Nombre: ").strip()
                 cantidad = leer_entero("Cantidad: ")
                 precio = leer_flotante("Precio: ")
                 producto = Producto(id_, nombre, cantidad, precio)
                 if inventario.anadir_producto(producto):
-                    print("Producto añadido y guardado en archivo.")
+                    print("Producto añadido (se guardará automáticamente).")
                 else:
                     print("Ya existe un producto con ese ID. No se añadió.")
-            except PermissionError as e:
-                print(f"Error permisos al guardar: {e}")
-            except OSError as e:
-                print(f"Error E/S al guardar: {e}")
             except Exception as e:
                 print(f"Error al crear/validar el producto: {e}")
 
         elif opcion == "2":
-            try:
-                id_ = leer_entero("ID del producto a eliminar: ")
-                if inventario.eliminar_por_id(id_):
-                    print("Producto eliminado y archivo actualizado.")
-                else:
-                    print("No existe un producto con ese ID.")
-            except PermissionError as e:
-                print(f"Error permisos al guardar: {e}")
-            except OSError as e:
-                print(f"Error E/S al guardar: {e}")
+            id_ = leer_entero("ID del producto a eliminar: ")
+            if inventario.eliminar_por_id(id_):
+                print("Producto eliminado (se guardará automáticamente).")
+            else:
+                print("No existe un producto con ese ID.")
 
         elif opcion == "3":
             try:
                 id_ = leer_entero("ID del producto a actualizar: ")
-                actualizar_cantidad = input("¿Actualizar cantidad? (s/n): ").strip().lower() == "s"
+                actualizar_cantidad = _leer_linea("¿Actualizar cantidad? (s/n): ").strip().lower() == "s"
                 cantidad: Optional[int] = None
                 precio: Optional[float] = None
                 if actualizar_cantidad:
                     cantidad = leer_entero("Nueva cantidad: ")
-                actualizar_precio = input("¿Actualizar precio? (s/n): ").strip().lower() == "s"
+                actualizar_precio = _leer_linea("¿Actualizar precio? (s/n): ").strip().lower() == "s"
                 if actualizar_precio:
                     precio = leer_flotante("Nuevo precio: ")
                 ok = inventario.actualizar_por_id(id_, cantidad=cantidad, precio=precio)
                 if ok:
-                    print("Producto actualizado y guardado en archivo.")
+                    print("Producto actualizado (se guardará automáticamente).")
                 else:
                     print(" No existe un producto con ese ID.")
             except (TypeError, ValueError) as ve:
                 print(f"Error datos inválidos: {ve}")
-            except PermissionError as e:
-                print(f"Error permisos al guardar: {e}")
-            except OSError as e:
-                print(f"Error E/S al guardar: {e}")
 
         elif opcion == "4":
-            termino = input("Nombre o parte del nombre a buscar: ").strip()
-            resultados = inventario.buscar_por_nombre(termino)
+            termino = _leer_linea("Nombre o parte del nombre a buscar: ").strip()
+            resultados = inventario.buscar_por_nombre(termino, limite=50)
             print(f"Resultados para '{termino}':")
             imprimir_tabla(resultados)
 
         elif opcion == "5":
             imprimir_tabla(inventario.mostrar_todos())
 
+        elif opcion == "6":
+            print(f"Valor total del inventario: ${inventario.valor_total():.2f}")
+
         elif opcion == "0":
+            try:
+                inventario.flush()
+            except PermissionError as e:
+                print(f"Error permisos al guardar: {e}")
+            except OSError as e:
+                print(f"Error E/S al guardar: {e}")
             print("Adiós.")
             break
         else: